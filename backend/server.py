@@ -1,16 +1,42 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure, PyMongoError
 from bson import ObjectId
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+import asyncio
+import logging
+import orjson
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="Meu Jovinho Game API")
+logger = logging.getLogger(__name__)
+
+def utc_now() -> datetime:
+    """
+    Timezone-aware current UTC time, as stored in last_played
+    """
+    return datetime.now(timezone.utc)
+
+class MongoJSONResponse(ORJSONResponse):
+    """
+    orjson response that falls back to str() for BSON types such as ObjectId
+    """
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+app = FastAPI(title="Meu Jovinho Game API", default_response_class=MongoJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -21,12 +47,339 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads such as the leaderboard and statistics
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # MongoDB connection
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URL)
-db = client.meu_jovinho_db
-game_data_collection = db.game_data
-leaderboard_collection = db.leaderboard
+# Per uvicorn worker; the driver default of 100 over-allocates across workers
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+# Long enough to ride out a replica-set election (~10-12s) instead of failing
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+client = None
+db = None
+game_data_collection = None
+leaderboard_collection = None
+index_builder = None
+INDEX_RETRY_SECONDS = 5
+# Set once LEADERBOARD_INDEX is known to exist; MongoDB rejects a hint
+# naming a missing index, so queries only hint it after that
+leaderboard_index_ready = False
+
+# Leaderboard order plus every returned field, so the query is covered
+LEADERBOARD_INDEX = [
+    ("max_level", DESCENDING),
+    ("total_score", DESCENDING),
+    ("player_id", ASCENDING),
+    ("items_collected", ASCENDING),
+    ("games_played", ASCENDING),
+    ("last_played", ASCENDING)
+]
+
+async def create_index_with_retry(keys, **kwargs) -> bool:
+    """
+    Create one index, retrying until the database is reachable. Returns
+    whether the index exists.
+    """
+    while True:
+        try:
+            # Idempotent: a no-op once the index exists
+            await game_data_collection.create_index(keys, **kwargs)
+            return True
+        except ConnectionFailure as e:
+            logger.warning("Index creation failed, retrying in %ss: %s", INDEX_RETRY_SECONDS, e)
+            await asyncio.sleep(INDEX_RETRY_SECONDS)
+        except PyMongoError as e:
+            # Not transient (e.g. duplicate player documents); retrying won't help
+            logger.error("Index creation failed for %s: %s", keys, e)
+            return False
+
+async def ensure_indexes():
+    """
+    Create the collection indexes one at a time, so a failed unique build
+    can't keep the leaderboard index from being created
+    """
+    global leaderboard_index_ready
+    leaderboard_index_ready = await create_index_with_retry(LEADERBOARD_INDEX)
+    await create_index_with_retry([("player_id", ASCENDING)], unique=True)
+
+def leaderboard_hint() -> Optional[list]:
+    """
+    LEADERBOARD_INDEX once it exists, otherwise None (no hint)
+    """
+    return LEADERBOARD_INDEX if leaderboard_index_ready else None
+
+@app.on_event("startup")
+async def startup_db_client():
+    global client, db, game_data_collection, leaderboard_collection, index_builder
+    client = AsyncIOMotorClient(
+        MONGO_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS
+    )
+    db = client.meu_jovinho_db
+    game_data_collection = db.game_data
+    leaderboard_collection = db.leaderboard
+    
+    # Built in the background so the app still boots while Mongo is down;
+    # /api/health reports the outage in the meantime
+    index_builder = asyncio.create_task(ensure_indexes())
+    
+    global session_queue, session_flusher
+    session_queue = asyncio.Queue(maxsize=SESSION_QUEUE_SIZE)
+    session_flusher = asyncio.create_task(flush_game_sessions())
+
+@app.on_event("shutdown")
+async def shutdown_db_client():
+    # Write out sessions still queued before dropping the connection
+    try:
+        await asyncio.wait_for(session_queue.join(), SESSION_WRITE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Shutting down with %d game sessions unwritten", session_queue.qsize())
+    session_flusher.cancel()
+    index_builder.cancel()
+    client.close()
+
+# Redis cache for the read-heavy ranking endpoints
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+CACHE_TTL_SECONDS = 30
+LEADERBOARD_CACHE_KEY = "leaderboard:top"  # hash of limit -> cached response
+STATS_CACHE_KEY = "stats:global"
+# Bumped on every invalidation. A fill only writes if the generation is the
+# one read before its Mongo query, so a fetch that overlapped a write on any
+# worker can't repopulate the cache with pre-write data.
+CACHE_GENERATION_KEY = "rankings:generation"
+# Short socket timeouts keep a blackholed Redis from stalling requests; a
+# timeout is a RedisError and is treated like any other cache failure
+REDIS_TIMEOUT_SECONDS = float(os.getenv("REDIS_TIMEOUT_SECONDS", "0.25"))
+redis_client = None
+
+@app.on_event("startup")
+async def startup_cache_client():
+    global redis_client
+    redis_client = Redis.from_url(
+        REDIS_URL,
+        socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_TIMEOUT_SECONDS
+    )
+
+@app.on_event("shutdown")
+async def shutdown_cache_client():
+    await redis_client.aclose()
+
+async def get_cached(key: str, field: Optional[str] = None):
+    """
+    Return (cached JSON response or None, cache generation). The generation
+    is None when Redis is unavailable, which also disables the later fill.
+    """
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(CACHE_GENERATION_KEY)
+            if field is None:
+                pipe.get(key)
+            else:
+                pipe.hget(key, field)
+            generation, value = await pipe.execute()
+    except RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None, None
+    generation = generation or b"0"
+    if value is None:
+        return None, generation
+    return Response(content=value, media_type="application/json"), generation
+
+async def set_cached(key: str, response: Response, generation: Optional[bytes], field: Optional[str] = None):
+    """
+    Cache a rendered response body for CACHE_TTL_SECONDS, unless the cache
+    was invalidated since generation was read
+    """
+    if generation is None:
+        return
+    value = response.body
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            await pipe.watch(CACHE_GENERATION_KEY)
+            if (await pipe.get(CACHE_GENERATION_KEY) or b"0") != generation:
+                return
+            pipe.multi()
+            if field is None:
+                pipe.set(key, value, ex=CACHE_TTL_SECONDS)
+            else:
+                pipe.hset(key, field, value)
+                pipe.expire(key, CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except WatchError:
+        # Invalidated between the check and the write; leave the cache empty
+        pass
+    except RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+async def invalidate_cached_rankings():
+    """
+    Drop cached leaderboard and statistics after player data changes
+    """
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(CACHE_GENERATION_KEY)
+            pipe.delete(LEADERBOARD_CACHE_KEY, STATS_CACHE_KEY)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Cache invalidation failed: %s", e)
+
+# Per-process cache of rendered game-data responses; absorbs client polling
+# bursts and is invalidated on every write to the player
+PLAYER_CACHE_TTL_SECONDS = 2
+player_cache = TTLCache(maxsize=10_000, ttl=PLAYER_CACHE_TTL_SECONDS)
+# Token per in-flight cache fill; a write drops it so a read that overlapped
+# the write doesn't store pre-write data. Entries live only while a read runs.
+player_cache_fills = {}
+
+def invalidate_player_cache(player_id: str):
+    """
+    Drop a player's cached game data and any fill racing the write
+    """
+    player_cache.pop(player_id, None)
+    player_cache_fills.pop(player_id, None)
+
+# Game session writes are queued and flushed as bulk_write batches. A batch
+# takes whatever queued up while the previous one was in flight, so bursts
+# coalesce without delaying a lone request.
+SESSION_BATCH_SIZE = 500
+# Caps memory and latency when Mongo falls behind; producers wait for room
+SESSION_QUEUE_SIZE = 5000
+# Upper bound on how long a request waits to be queued and written
+SESSION_WRITE_TIMEOUT_SECONDS = float(os.getenv("SESSION_WRITE_TIMEOUT_SECONDS", "10"))
+session_queue = None
+session_flusher = None
+
+async def queue_game_session(player_id: str, update: dict) -> asyncio.Future:
+    """
+    Queue a session upsert, waiting for room if the queue is full, and
+    return the future the flusher resolves once it is applied
+    """
+    future = asyncio.get_running_loop().create_future()
+    await session_queue.put((player_id, update, future))
+    return future
+
+async def flush_game_sessions():
+    """
+    Background task draining session_queue into bulk writes
+    """
+    while True:
+        batch = [await session_queue.get()]
+        while len(batch) < SESSION_BATCH_SIZE and not session_queue.empty():
+            batch.append(session_queue.get_nowait())
+        try:
+            await write_game_sessions(batch)
+        except Exception as e:
+            logger.exception("Game session batch failed")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for _ in batch:
+                session_queue.task_done()
+
+def merge_session_updates(updates: List[dict]) -> dict:
+    """
+    Fold one player's session updates, in queue order, into a single update
+    with the same effect as applying them one after another
+    """
+    merged = {"$inc": {}, "$max": {}, "$set": {}, "$setOnInsert": {}}
+    for update in updates:
+        for field, amount in update.get("$inc", {}).items():
+            merged["$inc"][field] = merged["$inc"].get(field, 0) + amount
+        for field, value in update.get("$max", {}).items():
+            if field not in merged["$max"] or value > merged["$max"][field]:
+                merged["$max"][field] = value
+        # A later $set overwrites an earlier one, as it would in sequence
+        merged["$set"].update(update.get("$set", {}))
+        merged["$setOnInsert"].update(update.get("$setOnInsert", {}))
+    # A field can't be in both; whatever is $set is final even on insert
+    for field in merged["$set"]:
+        merged["$setOnInsert"].pop(field, None)
+    return {operator: fields for operator, fields in merged.items() if fields}
+
+async def write_game_sessions(batch):
+    """
+    Apply a batch of (player_id, update, future) session upserts and resolve
+    each future with the player's updated document
+    """
+    if len(batch) == 1:
+        # A lone session gets its own post-image in a single round-trip
+        player_id, update, future = batch[0]
+        updated = await game_data_collection.find_one_and_update(
+            {"player_id": player_id},
+            update,
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        invalidate_player_cache(player_id)
+        if not future.done():
+            future.set_result(updated)
+        await invalidate_cached_rankings()
+        return
+    
+    # Each player's sessions are merged into one upsert, so the batch is a
+    # single unordered bulk_write with no two writes to the same document.
+    # Every session of a player then reads back the player's document after
+    # the whole batch, including sessions queued after it.
+    sessions_by_player = {}
+    for player_id, update, future in batch:
+        sessions_by_player.setdefault(player_id, []).append((update, future))
+    player_ids = list(sessions_by_player)
+    requests = [
+        UpdateOne(
+            {"player_id": player_id},
+            merge_session_updates([update for update, _ in sessions_by_player[player_id]]),
+            upsert=True
+        )
+        for player_id in player_ids
+    ]
+    
+    failures = {}
+    try:
+        await game_data_collection.bulk_write(requests, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details["writeErrors"]:
+            failures[player_ids[error["index"]]] = OperationFailure(error["errmsg"], error["code"])
+    
+    for player_id, error in failures.items():
+        for _, future in sessions_by_player[player_id]:
+            if not future.done():
+                future.set_exception(error)
+    
+    written = [player_id for player_id in player_ids if player_id not in failures]
+    if not written:
+        return
+    
+    for player_id in written:
+        invalidate_player_cache(player_id)
+    
+    # One read for every post-image in the batch. The sessions are recorded
+    # either way, so if it fails they still succeed, with no updated data,
+    # rather than inviting a retry that would count them twice. A player
+    # reset in the meantime also reads back as None.
+    try:
+        updated = await game_data_collection.find(
+            {"player_id": {"$in": written}},
+            {"_id": 0}
+        ).to_list(length=None)
+        updated_by_player = {doc["player_id"]: doc for doc in updated}
+    except Exception as e:
+        logger.warning("Reading back recorded sessions failed: %s", e)
+        updated_by_player = {}
+    
+    for player_id in written:
+        for _, future in sessions_by_player[player_id]:
+            if not future.done():
+                future.set_result(updated_by_player.get(player_id))
+    
+    # Requests are already answered; the ranking cache is cleared afterwards
+    await invalidate_cached_rankings()
 
 # Pydantic models
 class GameData(BaseModel):
@@ -55,29 +408,51 @@ class GameSession(BaseModel):
     time_played: Optional[int] = None  # in seconds
 
 @app.get("/api/")
-def read_root():
+async def read_root():
     return {"message": "Meu Jovinho Game API is running!"}
 
+# Reuse a successful health check for a few seconds so frequent probes
+# don't each cost a database round-trip
+HEALTH_CACHE_SECONDS = 5
+last_health_check = (0.0, None)
+
 @app.get("/api/health")
-def health_check():
+async def health_check():
+    global last_health_check
+    checked_at, cached_result = last_health_check
+    if cached_result is not None and time.monotonic() - checked_at < HEALTH_CACHE_SECONDS:
+        return cached_result
     try:
         # Test database connection
-        client.admin.command('ismaster')
-        return {"status": "healthy", "database": "connected"}
+        await client.admin.command('ping')
+        result = {"status": "healthy", "database": "connected"}
+        last_health_check = (time.monotonic(), result)
+        return result
     except Exception as e:
         return {"status": "unhealthy", "error": str(e)}
 
 # Game Data Management
 @app.get("/api/game-data/{player_id}")
-def get_game_data(player_id: str):
+async def get_game_data(player_id: str):
     """
     Get player's game progress and statistics
     """
     try:
-        game_data = game_data_collection.find_one({"player_id": player_id})
+        cached = player_cache.get(player_id)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
+        fill = object()
+        player_cache_fills[player_id] = fill
+        try:
+            game_data = await game_data_collection.find_one({"player_id": player_id}, {"_id": 0})
+        finally:
+            still_valid = player_cache_fills.get(player_id) is fill
+            if still_valid:
+                del player_cache_fills[player_id]
         if not game_data:
             # Return default data for new player
-            return {
+            game_data = {
                 "player_id": player_id,
                 "current_level": 1,
                 "max_level": 1,
@@ -87,26 +462,31 @@ def get_game_data(player_id: str):
                 "last_played": None
             }
         
-        # Convert ObjectId to string for JSON serialization
-        game_data["_id"] = str(game_data["_id"])
-        return game_data
+        # Returned directly to skip a jsonable_encoder pass over the document
+        response = MongoJSONResponse(game_data)
+        if still_valid:
+            player_cache[player_id] = response.body
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving game data: {str(e)}")
 
 @app.post("/api/game-data")
-def save_game_data(game_data: GameData):
+async def save_game_data(game_data: GameData):
     """
     Save or update player's game progress
     """
     try:
-        game_data.last_played = datetime.now()
+        payload = game_data.model_dump()
+        payload["last_played"] = utc_now()
         
         # Update or insert game data
-        result = game_data_collection.update_one(
+        result = await game_data_collection.update_one(
             {"player_id": game_data.player_id},
-            {"$set": game_data.dict()},
+            {"$set": payload},
             upsert=True
         )
+        invalidate_player_cache(game_data.player_id)
+        await invalidate_cached_rankings()
         
         return {
             "success": True,
@@ -118,108 +498,137 @@ def save_game_data(game_data: GameData):
         raise HTTPException(status_code=500, detail=f"Error saving game data: {str(e)}")
 
 @app.post("/api/game-session")
-def record_game_session(session: GameSession):
+async def record_game_session(session: GameSession):
     """
     Record a completed game session
     """
     try:
-        # Get current player data
-        current_data = game_data_collection.find_one({"player_id": session.player_id})
-        
-        if not current_data:
-            # Create new player data
-            new_data = {
-                "player_id": session.player_id,
-                "current_level": session.level if session.completed else 1,
-                "max_level": session.level if session.completed else 1,
+        # Apply the session server-side as an atomic upsert; new players
+        # start from the values the $inc/$max operators seed on insert.
+        # last_played uses $max so an older session can't overwrite it.
+        update = {
+            "$inc": {
                 "total_score": session.score,
                 "items_collected": session.items_collected,
-                "games_played": 1,
-                "last_played": datetime.now()
+                "games_played": 1
+            },
+            "$max": {
+                "max_level": session.level if session.completed else 1,
+                "last_played": utc_now()
             }
+        }
+        if session.completed:
+            update["$set"] = {"current_level": session.level}
         else:
-            # Update existing player data
-            new_data = {
-                "player_id": session.player_id,
-                "current_level": session.level if session.completed else current_data.get("current_level", 1),
-                "max_level": max(session.level, current_data.get("max_level", 1)) if session.completed else current_data.get("max_level", 1),
-                "total_score": current_data.get("total_score", 0) + session.score,
-                "items_collected": current_data.get("items_collected", 0) + session.items_collected,
-                "games_played": current_data.get("games_played", 0) + 1,
-                "last_played": datetime.now()
-            }
+            update["$setOnInsert"] = {"current_level": 1}
         
-        # Save updated data
-        game_data_collection.update_one(
-            {"player_id": session.player_id},
-            {"$set": new_data},
-            upsert=True
+        deadline = time.monotonic() + SESSION_WRITE_TIMEOUT_SECONDS
+        future = await asyncio.wait_for(
+            queue_game_session(session.player_id, update),
+            SESSION_WRITE_TIMEOUT_SECONDS
         )
+        try:
+            new_data = await asyncio.wait_for(
+                asyncio.shield(future),
+                max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            # Already queued, so it will still be written; answering with an
+            # error here would invite a retry that counts it twice
+            return MongoJSONResponse({
+                "success": True,
+                "message": "Game session accepted and will be recorded shortly",
+                "updated_data": None
+            }, status_code=202)
         
         return {
             "success": True,
             "message": "Game session recorded successfully",
             "updated_data": new_data
         }
+    except asyncio.TimeoutError:
+        # Only reached while waiting for queue space: nothing was queued, so
+        # the request is safe to retry
+        raise HTTPException(status_code=503, detail="Game session queue is full, try again")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error recording game session: {str(e)}")
 
 # Leaderboard Management
 @app.get("/api/leaderboard")
-def get_leaderboard(limit: int = 10):
+async def get_leaderboard(limit: int = 10):
     """
     Get top players leaderboard
     """
     try:
+        cached, generation = await get_cached(LEADERBOARD_CACHE_KEY, str(limit))
+        if cached is not None:
+            return cached
+        
         # Get top players by max level, then by total score
-        leaderboard = list(game_data_collection.find()
-                          .sort([("max_level", -1), ("total_score", -1)])
-                          .limit(limit))
+        projection = {
+            "_id": 0,
+            "player_id": 1,
+            "max_level": 1,
+            "total_score": 1,
+            "items_collected": 1,
+            "games_played": 1,
+            "last_played": 1
+        }
+        leaderboard = await (game_data_collection.find({}, projection=projection)
+                             .hint(leaderboard_hint())
+                             .sort([("max_level", -1), ("total_score", -1)])
+                             .limit(limit)
+                             .to_list(length=None))
         
-        # Convert ObjectId to string and format data
-        formatted_leaderboard = []
-        for i, player in enumerate(leaderboard):
-            formatted_leaderboard.append({
-                "rank": i + 1,
-                "player_id": player["player_id"],
-                "max_level": player.get("max_level", 1),
-                "total_score": player.get("total_score", 0),
-                "items_collected": player.get("items_collected", 0),
-                "games_played": player.get("games_played", 0),
-                "last_played": player.get("last_played")
-            })
+        # Every write path stores all projected fields, so documents are
+        # returned as-is with their position prepended
+        formatted_leaderboard = [
+            {"rank": rank, **player}
+            for rank, player in enumerate(leaderboard, start=1)
+        ]
         
-        return {
+        response = MongoJSONResponse({
             "leaderboard": formatted_leaderboard,
-            "total_players": game_data_collection.count_documents({})
-        }
+            "total_players": await game_data_collection.estimated_document_count()
+        })
+        await set_cached(LEADERBOARD_CACHE_KEY, response, generation, str(limit))
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving leaderboard: {str(e)}")
 
 @app.get("/api/player-rank/{player_id}")
-def get_player_rank(player_id: str):
+async def get_player_rank(player_id: str):
     """
     Get specific player's rank in leaderboard
     """
     try:
         # Get player data
-        player_data = game_data_collection.find_one({"player_id": player_id})
+        player_data = await game_data_collection.find_one(
+            {"player_id": player_id},
+            {"_id": 0, "max_level": 1, "total_score": 1, "items_collected": 1, "games_played": 1}
+        )
         if not player_data:
             return {"rank": None, "message": "Player not found"}
         
-        # Count players with better stats
-        better_players = game_data_collection.count_documents({
-            "$or": [
-                {"max_level": {"$gt": player_data.get("max_level", 1)}},
-                {
-                    "max_level": player_data.get("max_level", 1),
-                    "total_score": {"$gt": player_data.get("total_score", 0)}
-                }
-            ]
-        })
+        # Count players ranked strictly above (max_level, total_score); once
+        # the leaderboard index exists the hint keeps both $or branches on
+        # bounded scans of it
+        max_level = player_data.get("max_level", 1)
+        total_score = player_data.get("total_score", 0)
+        hint = leaderboard_hint()
+        count_options = {"hint": hint} if hint else {}
+        better_players = await game_data_collection.count_documents(
+            {
+                "$or": [
+                    {"max_level": {"$gt": max_level}},
+                    {"max_level": max_level, "total_score": {"$gt": total_score}}
+                ]
+            },
+            **count_options
+        )
         
         rank = better_players + 1
-        total_players = game_data_collection.count_documents({})
+        total_players = await game_data_collection.estimated_document_count()
         
         return {
             "rank": rank,
@@ -237,40 +646,53 @@ def get_player_rank(player_id: str):
 
 # Game Statistics
 @app.get("/api/stats")
-def get_game_statistics():
+async def get_game_statistics():
     """
     Get overall game statistics
     """
     try:
-        total_players = game_data_collection.count_documents({})
+        cached, generation = await get_cached(STATS_CACHE_KEY)
+        if cached is not None:
+            return cached
         
-        # Aggregate statistics
+        # Aggregate totals, player count and average in a single $group
         pipeline = [
+            {
+                "$project": {
+                    "_id": 0,
+                    "total_score": 1,
+                    "items_collected": 1,
+                    "games_played": 1,
+                    "max_level": 1
+                }
+            },
             {
                 "$group": {
                     "_id": None,
+                    "total_players": {"$sum": 1},
                     "total_score": {"$sum": "$total_score"},
                     "total_items_collected": {"$sum": "$items_collected"},
                     "total_games_played": {"$sum": "$games_played"},
-                    "max_level_reached": {"$max": "$max_level"}
+                    "max_level_reached": {"$max": "$max_level"},
+                    "average_score_per_player": {"$avg": "$total_score"}
                 }
             }
         ]
         
-        stats_result = list(game_data_collection.aggregate(pipeline))
+        stats_result = await game_data_collection.aggregate(pipeline).to_list(length=1)
         
         if stats_result:
             stats = stats_result[0]
-            return {
-                "total_players": total_players,
+            statistics = {
+                "total_players": stats["total_players"],
                 "total_score": stats.get("total_score", 0),
                 "total_items_collected": stats.get("total_items_collected", 0),
                 "total_games_played": stats.get("total_games_played", 0),
                 "max_level_reached": stats.get("max_level_reached", 1),
-                "average_score_per_player": stats.get("total_score", 0) / max(total_players, 1)
+                "average_score_per_player": stats.get("average_score_per_player") or 0
             }
         else:
-            return {
+            statistics = {
                 "total_players": 0,
                 "total_score": 0,
                 "total_items_collected": 0,
@@ -278,17 +700,23 @@ def get_game_statistics():
                 "max_level_reached": 1,
                 "average_score_per_player": 0
             }
+        
+        response = MongoJSONResponse(statistics)
+        await set_cached(STATS_CACHE_KEY, response, generation)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving game statistics: {str(e)}")
 
 # Admin endpoints
 @app.delete("/api/admin/reset-player/{player_id}")
-def reset_player_data(player_id: str):
+async def reset_player_data(player_id: str):
     """
     Reset specific player's game data (admin function)
     """
     try:
-        result = game_data_collection.delete_one({"player_id": player_id})
+        result = await game_data_collection.delete_one({"player_id": player_id})
+        invalidate_player_cache(player_id)
+        await invalidate_cached_rankings()
         
         return {
             "success": True,
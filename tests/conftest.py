@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+# server.py lives in backend/ and is imported as a top-level module
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import server  # noqa: E402
+
+
+class StubCursor:
+    def __init__(self, documents):
+        self.documents = documents
+    
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class StubCollection:
+    """
+    Async stand-in for the game_data collection that records every call.
+    Reads are served from documents; writes are recorded but not applied.
+    errors maps a method name to an exception to raise, or to a function
+    of the call's arguments returning one (or None to let the call through).
+    hooks maps a method name to a function of the call's arguments run
+    just before the call returns.
+    """
+    def __init__(self, documents=(), errors=None, hooks=None):
+        self.documents = [dict(document) for document in documents]
+        self.errors = errors or {}
+        self.hooks = hooks or {}
+        self.calls = []
+    
+    def record(self, name, *args, **kwargs):
+        self.calls.append((name, args, kwargs))
+        error = self.errors.get(name)
+        if callable(error) and not isinstance(error, BaseException):
+            error = error(*args, **kwargs)
+        if error:
+            raise error
+    
+    def finish(self, name, *args, **kwargs):
+        if name in self.hooks:
+            self.hooks[name](*args, **kwargs)
+    
+    def calls_to(self, name):
+        return [(args, kwargs) for called, args, kwargs in self.calls if called == name]
+    
+    def matching(self, filter):
+        player_id = filter["player_id"]
+        if isinstance(player_id, dict):
+            return [dict(doc) for doc in self.documents if doc["player_id"] in player_id["$in"]]
+        return [dict(doc) for doc in self.documents if doc["player_id"] == player_id]
+    
+    async def create_index(self, keys, **kwargs):
+        self.record("create_index", keys, **kwargs)
+    
+    async def find_one(self, filter, projection=None):
+        self.record("find_one", filter, projection)
+        documents = self.matching(filter)
+        self.finish("find_one", filter, projection)
+        return documents[0] if documents else None
+    
+    def find(self, filter, projection=None):
+        self.record("find", filter, projection)
+        documents = self.matching(filter)
+        self.finish("find", filter, projection)
+        return StubCursor(documents)
+    
+    async def find_one_and_update(self, filter, update, **kwargs):
+        self.record("find_one_and_update", filter, update, **kwargs)
+        documents = self.matching(filter)
+        self.finish("find_one_and_update", filter, update, **kwargs)
+        return documents[0] if documents else None
+    
+    async def bulk_write(self, requests, **kwargs):
+        self.record("bulk_write", requests, **kwargs)
+        self.finish("bulk_write", requests, **kwargs)
+
+
+@pytest.fixture
+def stub_collection(monkeypatch):
+    """
+    Install a StubCollection as server.game_data_collection
+    """
+    def install(*args, **kwargs):
+        collection = StubCollection(*args, **kwargs)
+        monkeypatch.setattr(server, "game_data_collection", collection)
+        return collection
+    return install
@@ -0,0 +1,37 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    server.player_cache.clear()
+    server.player_cache_fills.clear()
+    yield
+    server.player_cache.clear()
+    server.player_cache_fills.clear()
+
+
+def test_game_data_is_served_from_cache(stub_collection):
+    collection = stub_collection([{"player_id": "p1", "total_score": 5}])
+    api = TestClient(server.app)
+    
+    assert api.get("/api/game-data/p1").json() == {"player_id": "p1", "total_score": 5}
+    assert api.get("/api/game-data/p1").json() == {"player_id": "p1", "total_score": 5}
+    assert len(collection.calls_to("find_one")) == 1
+    assert server.player_cache_fills == {}
+
+
+def test_write_during_fetch_skips_cache_fill(stub_collection):
+    # The write lands after find_one read the old document but before the
+    # handler stores it
+    stub_collection(
+        [{"player_id": "p1", "total_score": 5}],
+        hooks={"find_one": lambda *args: server.invalidate_player_cache("p1")}
+    )
+    api = TestClient(server.app)
+    
+    assert api.get("/api/game-data/p1").json()["total_score"] == 5
+    assert "p1" not in server.player_cache
+    assert server.player_cache_fills == {}
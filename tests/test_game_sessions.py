@@ -0,0 +1,218 @@
+import asyncio
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+import server
+
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    calls = []
+    
+    async def invalidate_cached_rankings():
+        calls.append(True)
+    
+    monkeypatch.setattr(server, "invalidate_cached_rankings", invalidate_cached_rankings)
+    return calls
+
+
+def write(player_ids, futures_seen=None, update=None):
+    """
+    Run one batch through write_game_sessions and return its settled futures
+    """
+    update = update or {"$inc": {"games_played": 1}}
+    
+    async def run():
+        loop = asyncio.get_running_loop()
+        batch = [(player_id, update, loop.create_future()) for player_id in player_ids]
+        if futures_seen is not None:
+            futures_seen.extend(future for _, _, future in batch)
+        await server.write_game_sessions(batch)
+        return [future for _, _, future in batch]
+    
+    return asyncio.run(run())
+
+
+def session_update(score, level, completed):
+    update = {
+        "$inc": {"total_score": score, "items_collected": 1, "games_played": 1},
+        "$max": {"max_level": level if completed else 1}
+    }
+    if completed:
+        update["$set"] = {"current_level": level}
+    else:
+        update["$setOnInsert"] = {"current_level": 1}
+    return update
+
+
+def test_merge_sums_increments_and_keeps_the_last_completed_level():
+    merged = server.merge_session_updates([
+        session_update(10, 3, True),
+        session_update(5, 7, False),
+        session_update(2, 2, True)
+    ])
+    
+    assert merged == {
+        "$inc": {"total_score": 17, "items_collected": 3, "games_played": 3},
+        "$max": {"max_level": 3},
+        "$set": {"current_level": 2}
+    }
+
+
+def test_merge_seeds_current_level_only_without_a_completed_session():
+    merged = server.merge_session_updates([session_update(1, 4, False), session_update(2, 5, False)])
+    
+    assert merged["$setOnInsert"] == {"current_level": 1}
+    assert "$set" not in merged
+
+
+def test_sessions_for_one_player_are_merged_into_one_write(stub_collection, invalidations):
+    collection = stub_collection([{"player_id": "a"}, {"player_id": "b"}])
+    
+    futures = write(["a", "b", "a"])
+    
+    assert [args[0] for args, _ in collection.calls_to("bulk_write")] == [[
+        UpdateOne({"player_id": "a"}, {"$inc": {"games_played": 2}}, upsert=True),
+        UpdateOne({"player_id": "b"}, {"$inc": {"games_played": 1}}, upsert=True)
+    ]]
+    # Every session of a player gets the player's document after the batch
+    assert [future.result() for future in futures] == [{"player_id": "a"}, {"player_id": "b"}, {"player_id": "a"}]
+    assert invalidations == [True]
+
+
+def test_single_session_returns_its_own_post_image(stub_collection, invalidations):
+    collection = stub_collection([{"player_id": "a", "games_played": 4}])
+    
+    futures = write(["a"])
+    
+    assert futures[0].result() == {"player_id": "a", "games_played": 4}
+    (filter, update), options = collection.calls_to("find_one_and_update")[0]
+    assert filter == {"player_id": "a"}
+    assert options["upsert"] and options["return_document"] == server.ReturnDocument.AFTER
+    assert collection.calls_to("bulk_write") == [] and collection.calls_to("find") == []
+    assert invalidations == [True]
+
+
+def test_partial_bulk_write_error_fails_only_the_failed_session(stub_collection, invalidations):
+    error = BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"}]})
+    stub_collection([{"player_id": "a"}, {"player_id": "c"}], errors={"bulk_write": error})
+    
+    futures = write(["a", "b", "c"])
+    
+    assert futures[0].result() == {"player_id": "a"}
+    assert isinstance(futures[1].exception(), OperationFailure)
+    assert "E11000" in str(futures[1].exception())
+    assert futures[2].result() == {"player_id": "c"}
+    assert invalidations == [True]
+
+
+def test_partial_bulk_write_error_fails_every_session_of_that_player(stub_collection, invalidations):
+    error = BulkWriteError({"writeErrors": [{"index": 0, "code": 11000, "errmsg": "E11000 duplicate key"}]})
+    stub_collection([{"player_id": "b"}], errors={"bulk_write": error})
+    
+    futures = write(["a", "b", "a"])
+    
+    assert isinstance(futures[0].exception(), OperationFailure)
+    assert futures[1].result() == {"player_id": "b"}
+    assert futures[2].exception() is futures[0].exception()
+
+
+def test_failed_bulk_write_raises_without_invalidating(stub_collection, invalidations):
+    stub_collection(errors={"bulk_write": OperationFailure("not primary")})
+    
+    with pytest.raises(OperationFailure):
+        write(["a", "b"])
+    assert invalidations == []
+
+
+def test_read_back_failure_still_reports_the_sessions_as_recorded(stub_collection, invalidations):
+    stub_collection(errors={"find": OperationFailure("read timed out")})
+    
+    futures = write(["a", "b"])
+    
+    assert [future.result() for future in futures] == [None, None]
+    # The writes went through, so cached rankings are still dropped
+    assert invalidations == [True]
+
+
+def test_futures_resolve_before_ranking_cache_invalidation(monkeypatch, stub_collection):
+    futures = []
+    done_at_invalidation = []
+    
+    async def invalidate_cached_rankings():
+        done_at_invalidation.extend(future.done() for future in futures)
+    
+    monkeypatch.setattr(server, "invalidate_cached_rankings", invalidate_cached_rankings)
+    
+    stub_collection([{"player_id": "a"}, {"player_id": "b"}])
+    write(["a", "b"], futures_seen=futures)
+    
+    assert done_at_invalidation == [True, True]
+
+
+def test_record_game_session_rejects_retryably_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(server, "SESSION_WRITE_TIMEOUT_SECONDS", 0.01)
+    session = server.GameSession(player_id="a", level=2, score=10, items_collected=1, completed=True)
+    
+    async def run():
+        # Full queue and no flusher running
+        monkeypatch.setattr(server, "session_queue", asyncio.Queue(maxsize=1))
+        server.session_queue.put_nowait(None)
+        await server.record_game_session(session)
+    
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(run())
+    assert raised.value.status_code == 503
+
+
+def test_record_game_session_accepts_a_queued_session_that_is_slow_to_write(monkeypatch):
+    monkeypatch.setattr(server, "SESSION_WRITE_TIMEOUT_SECONDS", 0.01)
+    session = server.GameSession(player_id="a", level=2, score=10, items_collected=1, completed=True)
+    
+    async def run():
+        # Room in the queue but no flusher running
+        monkeypatch.setattr(server, "session_queue", asyncio.Queue())
+        response = await server.record_game_session(session)
+        return response, server.session_queue.qsize()
+    
+    response, queued = asyncio.run(run())
+    
+    assert response.status_code == 202
+    assert orjson.loads(response.body)["updated_data"] is None
+    assert queued == 1
+
+
+def test_concurrent_sessions_for_one_player_are_recorded_in_one_write(monkeypatch, stub_collection, invalidations):
+    played_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(server, "utc_now", lambda: played_at)
+    collection = stub_collection([{"player_id": "a", "total_score": 18}])
+    sessions = [
+        server.GameSession(player_id="a", level=3, score=10, items_collected=2, completed=True),
+        server.GameSession(player_id="a", level=5, score=5, items_collected=1, completed=False),
+        server.GameSession(player_id="a", level=2, score=3, items_collected=4, completed=True)
+    ]
+    
+    async def run():
+        monkeypatch.setattr(server, "session_queue", asyncio.Queue())
+        flusher = asyncio.create_task(server.flush_game_sessions())
+        try:
+            return await asyncio.gather(*(server.record_game_session(session) for session in sessions))
+        finally:
+            flusher.cancel()
+    
+    responses = asyncio.run(run())
+    
+    assert [args[0] for args, _ in collection.calls_to("bulk_write")] == [[
+        UpdateOne({"player_id": "a"}, {
+            "$inc": {"total_score": 18, "items_collected": 7, "games_played": 3},
+            "$max": {"max_level": 3, "last_played": played_at},
+            "$set": {"current_level": 2}
+        }, upsert=True)
+    ]]
+    # Each request gets the player's document as read back after the batch
+    assert [response["updated_data"] for response in responses] == [{"player_id": "a", "total_score": 18}] * 3
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+from pymongo.errors import OperationFailure
+
+import server
+
+
+@pytest.fixture(autouse=True)
+def index_not_ready(monkeypatch):
+    monkeypatch.setattr(server, "leaderboard_index_ready", False)
+
+
+def test_failed_unique_index_still_enables_leaderboard_hint(stub_collection):
+    collection = stub_collection(errors={
+        "create_index": lambda keys, **kwargs: OperationFailure("E11000 duplicate key") if kwargs.get("unique") else None
+    })
+    
+    asyncio.run(server.ensure_indexes())
+    
+    assert [args[0] for args, _ in collection.calls_to("create_index")] == [
+        server.LEADERBOARD_INDEX,
+        [("player_id", 1)]
+    ]
+    assert server.leaderboard_hint() == server.LEADERBOARD_INDEX
+
+
+def test_failed_leaderboard_index_disables_hint(stub_collection):
+    stub_collection(errors={"create_index": OperationFailure("cannot create index")})
+    
+    asyncio.run(server.ensure_indexes())
+    
+    assert server.leaderboard_hint() is None
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+import server
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = AsyncMongoMockClient().meu_jovinho_db.game_data
+    monkeypatch.setattr(server, "game_data_collection", collection)
+    return collection
+
+
+@pytest.fixture
+def api(collection):
+    # No context manager: skip startup so no real Mongo or Redis is contacted
+    return TestClient(server.app)
+
+
+def add_players(collection, *players):
+    asyncio.run(collection.insert_many([
+        {
+            "player_id": player_id,
+            "current_level": max_level,
+            "max_level": max_level,
+            "total_score": total_score,
+            "items_collected": 3,
+            "games_played": 2
+        }
+        for player_id, max_level, total_score in players
+    ]))
+
+
+def test_player_rank_orders_by_level_then_score(api, collection):
+    add_players(collection, ("low", 5, 100), ("mid", 5, 200), ("top", 7, 10), ("tied", 5, 100))
+    
+    response = api.get("/api/player-rank/low")
+    
+    assert response.status_code == 200
+    assert response.json() == {
+        "rank": 3,
+        "total_players": 4,
+        "player_data": {
+            "player_id": "low",
+            "max_level": 5,
+            "total_score": 100,
+            "items_collected": 3,
+            "games_played": 2
+        }
+    }
+    assert api.get("/api/player-rank/tied").json()["rank"] == 3
+    assert api.get("/api/player-rank/top").json()["rank"] == 1
+
+
+def test_player_rank_unknown_player(api, collection):
+    add_players(collection, ("someone", 2, 20))
+    
+    response = api.get("/api/player-rank/nobody")
+    
+    assert response.status_code == 200
+    assert response.json() == {"rank": None, "message": "Player not found"}
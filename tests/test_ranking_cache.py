@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from fastapi.responses import Response
+
+import server
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    fake_server = FakeServer()
+    monkeypatch.setattr(server, "redis_client", FakeRedis(server=fake_server))
+    return fake_server
+
+
+def body(value):
+    return Response(content=value, media_type="application/json")
+
+
+def test_fill_is_cached_when_nothing_changed(redis_server):
+    async def scenario():
+        cached, generation = await server.get_cached(server.STATS_CACHE_KEY)
+        assert cached is None
+        await server.set_cached(server.STATS_CACHE_KEY, body(b'{"total_players":1}'), generation)
+        cached, _ = await server.get_cached(server.STATS_CACHE_KEY)
+        return cached
+    
+    cached = asyncio.run(scenario())
+    
+    assert cached.body == b'{"total_players":1}'
+
+
+def test_invalidation_from_another_worker_blocks_stale_fill(redis_server):
+    other_worker = FakeRedis(server=redis_server)
+    
+    async def scenario():
+        _, generation = await server.get_cached(server.LEADERBOARD_CACHE_KEY, "10")
+        # Another process records a session while this one queries Mongo
+        await other_worker.incr(server.CACHE_GENERATION_KEY)
+        await server.set_cached(server.LEADERBOARD_CACHE_KEY, body(b"stale"), generation, "10")
+        cached, _ = await server.get_cached(server.LEADERBOARD_CACHE_KEY, "10")
+        return cached
+    
+    assert asyncio.run(scenario()) is None
+
+
+def test_invalidate_drops_cached_rankings(redis_server):
+    async def scenario():
+        _, generation = await server.get_cached(server.STATS_CACHE_KEY)
+        await server.set_cached(server.STATS_CACHE_KEY, body(b"{}"), generation)
+        await server.invalidate_cached_rankings()
+        cached, new_generation = await server.get_cached(server.STATS_CACHE_KEY)
+        return cached, generation, new_generation
+    
+    cached, generation, new_generation = asyncio.run(scenario())
+    
+    assert cached is None
+    assert new_generation != generation